@@ -51,6 +51,12 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
 
 
+async def post_shutdown(application: Application):
+    """Close pooled database connections when the bot stops."""
+    db.pool.close()
+    logger.info("Database connections closed")
+
+
 def main():
     """Start the bot."""
     # Initialize database
@@ -60,8 +66,17 @@ def main():
     logger.info("Database ready")
 
     # Create application
+    # concurrent_updates: up to MAX_CONCURRENT_UPDATES updates are processed
+    # at once, so one user's slow update doesn't hold back other users, while
+    # a burst of updates can't start an unbounded number of tasks
     logger.info("Creating bot application...")
-    application = Application.builder().token(config.BOT_TOKEN).build()
+    application = (
+        Application.builder()
+        .token(config.BOT_TOKEN)
+        .concurrent_updates(config.MAX_CONCURRENT_UPDATES)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
 
     # Add handlers
     application.add_handler(CommandHandler("start", start_command))
@@ -73,7 +88,11 @@ def main():
 
     # Start bot
     logger.info("Starting bot...")
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+    application.run_polling(
+        allowed_updates=Update.ALL_TYPES,
+        timeout=config.POLLING_TIMEOUT,
+        poll_interval=0.0
+    )
 
 
 if __name__ == "__main__":
@@ -9,11 +9,18 @@ BOT_TOKEN = os.getenv('BOT_TOKEN')
 if not BOT_TOKEN:
     raise ValueError("BOT_TOKEN must be set in .env file")
 
+# Long polling timeout for getUpdates (seconds)
+POLLING_TIMEOUT = 20
+
+# Maximum number of updates processed concurrently
+MAX_CONCURRENT_UPDATES = 16
+
 # Admin whitelist (Telegram usernames without @)
 ADMIN_USERNAMES = os.getenv('ADMIN_USERNAME', '').split(',')
 
 # Database
 DATABASE_PATH = "database/words.db"
+DATABASE_POOL_SIZE = 4  # Read-only connections, in addition to one writer
 
 # Default settings
 DEFAULT_QUESTIONS_PER_SESSION = 5
@@ -2,17 +2,154 @@
 Database manager for Greek Learning Bot.
 Handles connection, initialization, and basic operations.
 """
+import asyncio
+import queue
 import sqlite3
 import logging
+import threading
 from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Iterable, Tuple
 
 import config
 from database.models import get_all_tables
 
 logger = logging.getLogger(__name__)
 
+# Per-connection settings, applied to every pooled connection
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -64000",
+    "PRAGMA mmap_size = 268435456",
+)
+
+
+class ConnectionPool:
+    """Thread-safe pool of long-lived SQLite connections: one writer, N readers.
+
+    SQLite allows a single writer at a time, so all writes share one
+    connection and queue up here instead of spinning on the busy timeout.
+    In WAL mode the read-only connections never wait for the writer.
+    """
+
+    def __init__(self, db_path: str, size: int = 4):
+        """Initialize connection pool.
+
+        Args:
+            db_path: Path to SQLite database file
+            size: Number of read-only connections to keep open (plus one writer)
+        """
+        self.db_path = db_path
+        self.size = size
+        self._writer = queue.Queue(maxsize=1)
+        self._readers = queue.Queue(maxsize=size)
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _create_connection(self, readonly: bool = False) -> sqlite3.Connection:
+        """Open a new connection that may be shared between threads."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Access columns by name
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        if readonly:
+            conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def _enable_wal(self, conn: sqlite3.Connection):
+        """Switch the database file to WAL mode (persists in the file itself)."""
+        journal_mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+        logger.info(f"SQLite journal_mode: {journal_mode}")
+
+    def initialize(self):
+        """Open all pool connections. Safe to call more than once."""
+        with self._lock:
+            if self._initialized:
+                return
+
+            # Writer first: it creates the database file and enables WAL
+            writer = self._create_connection()
+            self._enable_wal(writer)
+            self._writer.put(writer)
+
+            for _ in range(self.size):
+                self._readers.put(self._create_connection(readonly=True))
+
+            self._initialized = True
+            logger.info(f"Connection pool ready (1 writer + {self.size} readers)")
+
+    def _queue(self, readonly: bool) -> queue.Queue:
+        """Return the reader or writer queue."""
+        return self._readers if readonly else self._writer
+
+    def get(self, readonly: bool = False) -> sqlite3.Connection:
+        """Take a connection from the pool, blocking until one is free.
+
+        Args:
+            readonly: Take a read-only connection instead of the writer
+        """
+        if not self._initialized:
+            self.initialize()
+        return self._queue(readonly).get()
+
+    def put(self, conn: sqlite3.Connection, readonly: bool = False):
+        """Return a connection taken with get(readonly) to the pool."""
+        self._queue(readonly).put(conn)
+
+    def close(self):
+        """Close all idle connections in the pool.
+
+        The writer is closed last: closing the final connection checkpoints
+        the WAL into the database file.
+        """
+        with self._lock:
+            for pool in (self._readers, self._writer):
+                while not pool.empty():
+                    pool.get_nowait().close()
+            self._initialized = False
+
+
+class WordStore:
+    """In-memory snapshot of the words table for quiz generation."""
+
+    def __init__(self, manager: 'DatabaseManager'):
+        """Initialize empty word store.
+
+        Args:
+            manager: Database manager used to load words
+        """
+        self._manager = manager
+        self.words: List[Dict[str, Any]] = []
+        self.by_id: Dict[int, Dict[str, Any]] = {}
+        self.by_type: Dict[str, List[Dict[str, Any]]] = {}
+
+    def refresh(self):
+        """Reload all words from the database. Call after vocabulary changes."""
+        rows = self._manager.execute_query(
+            "SELECT id, greek, russian, word_type FROM words ORDER BY id",
+            row_factory=None
+        )
+
+        words = [
+            {'id': word_id, 'greek': greek, 'russian': russian, 'word_type': word_type}
+            for word_id, greek, russian, word_type in rows
+        ]
+        by_type: Dict[str, List[Dict[str, Any]]] = {}
+        for word in words:
+            by_type.setdefault(word['word_type'], []).append(word)
+
+        # Swap in complete structures so readers never see a partial load
+        self.by_id = {word['id']: word for word in words}
+        self.by_type = by_type
+        self.words = words
+
+        logger.info(f"Word store loaded {len(words)} words")
+
+    def is_empty(self) -> bool:
+        """Return True if no words are loaded."""
+        return not self.words
+
 
 class DatabaseManager:
     """Manages SQLite database connection and operations."""
@@ -24,17 +161,23 @@ class DatabaseManager:
             db_path: Path to SQLite database file. Uses config.DATABASE_PATH if not provided.
         """
         self.db_path = db_path or config.DATABASE_PATH
-        self._connection = None
+        self.pool = ConnectionPool(self.db_path, config.DATABASE_POOL_SIZE)
+        self.words = WordStore(self)
 
     @contextmanager
-    def get_connection(self):
-        """Context manager for database connections.
+    def get_connection(self, readonly: bool = False):
+        """Context manager for pooled database connections.
+
+        Connections are borrowed from the pool and returned afterwards,
+        never closed.
+
+        Args:
+            readonly: Borrow a read-only connection instead of the writer
 
         Yields:
             sqlite3.Connection: Database connection
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Access columns by name
+        conn = self.pool.get(readonly)
         try:
             yield conn
             conn.commit()
@@ -43,10 +186,27 @@ class DatabaseManager:
             logger.error(f"Database error: {e}")
             raise
         finally:
-            conn.close()
+            self.pool.put(conn, readonly)
+
+    @contextmanager
+    def transaction(self):
+        """Context manager running several statements in one write transaction.
+
+        Takes the write lock up front with BEGIN IMMEDIATE and commits once
+        on exit (rolls back on error).
+
+        Yields:
+            sqlite3.Cursor: Cursor on the pooled connection
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            yield cursor
 
     def initialize_database(self):
-        """Create all tables if they don't exist."""
+        """Open the connection pool and create all tables if they don't exist."""
+        self.pool.initialize()
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
@@ -58,42 +218,61 @@ class DatabaseManager:
 
             logger.info("Database initialized successfully")
 
-    def add_test_data(self):
-        """Add test data for development."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
+        self.words.refresh()
 
-            # Add test words
-            test_words = [
-                ('κάνω', 'делать', 'verb'),
-                ('Καλημέρα', 'Доброе утро', 'phrase'),
-                ('νερό', 'вода', 'noun'),
-                ('καλός', 'хороший', 'adjective'),
-                ('Ευχαριστώ', 'Спасибо', 'phrase'),
-                ('σπίτι', 'дом', 'noun'),
-                ('γρήγορα', 'быстро', 'adverb'),
-                ('εγώ', 'я', 'pronoun'),
-            ]
+    def add_words(self, words: Iterable[Tuple[str, str, str]]) -> int:
+        """Bulk insert words in a single transaction and reload the word store.
 
+        Args:
+            words: Iterable of (greek, russian, word_type) tuples; may be a generator
+
+        Returns:
+            Number of inserted rows
+        """
+        with self.transaction() as cursor:
             cursor.executemany(
                 'INSERT OR IGNORE INTO words (greek, russian, word_type) VALUES (?, ?, ?)',
-                test_words
+                words
             )
+            inserted = cursor.rowcount
+
+        self.words.refresh()
+        return inserted
+
+    def add_test_data(self):
+        """Add test data for development."""
+        # Add test words
+        test_words = [
+            ('κάνω', 'делать', 'verb'),
+            ('Καλημέρα', 'Доброе утро', 'phrase'),
+            ('νερό', 'вода', 'noun'),
+            ('καλός', 'хороший', 'adjective'),
+            ('Ευχαριστώ', 'Спасибо', 'phrase'),
+            ('σπίτι', 'дом', 'noun'),
+            ('γρήγορα', 'быстро', 'adverb'),
+            ('εγώ', 'я', 'pronoun'),
+        ]
 
-            logger.info(f"Added {len(test_words)} test words")
+        self.add_words(test_words)
 
-    def execute_query(self, query: str, params: tuple = ()) -> List[sqlite3.Row]:
+        logger.info(f"Added {len(test_words)} test words")
+
+    def execute_query(self, query: str, params: tuple = (),
+                      row_factory: Optional[Callable] = sqlite3.Row) -> List[Any]:
         """Execute SELECT query and return results.
 
         Args:
             query: SQL query string
             params: Query parameters
+            row_factory: Row factory for this query; None returns plain tuples
+                (cheaper, for hot paths that read columns by position)
 
         Returns:
-            List of rows as sqlite3.Row objects
+            List of rows as sqlite3.Row objects (or tuples)
         """
-        with self.get_connection() as conn:
+        with self.get_connection(readonly=True) as conn:
             cursor = conn.cursor()
+            cursor.row_factory = row_factory
             cursor.execute(query, params)
             return cursor.fetchall()
 
@@ -112,6 +291,32 @@ class DatabaseManager:
             cursor.execute(query, params)
             return cursor.rowcount
 
+    async def aquery(self, query: str, params: tuple = (),
+                     row_factory: Optional[Callable] = sqlite3.Row) -> List[Any]:
+        """Run execute_query in a worker thread so the event loop isn't blocked.
+
+        Args:
+            query: SQL query string
+            params: Query parameters
+            row_factory: Row factory for this query; None returns plain tuples
+
+        Returns:
+            List of rows as sqlite3.Row objects (or tuples)
+        """
+        return await asyncio.to_thread(self.execute_query, query, params, row_factory)
+
+    async def aupdate(self, query: str, params: tuple = ()) -> int:
+        """Run execute_update in a worker thread so the event loop isn't blocked.
+
+        Args:
+            query: SQL query string
+            params: Query parameters
+
+        Returns:
+            Number of affected rows
+        """
+        return await asyncio.to_thread(self.execute_update, query, params)
+
 
 # Global database instance
 db = DatabaseManager()
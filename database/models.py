@@ -1,6 +1,6 @@
 """
 Database schema definitions for Greek Learning Bot.
-Each function returns a CREATE TABLE SQL statement.
+Each function returns a CREATE TABLE or CREATE INDEX SQL statement.
 """
 
 def create_words_table():
@@ -91,13 +91,28 @@ def create_admins_table():
     );
     """
 
+def create_words_word_type_index():
+    """Index for filtering words by type (wrong answer generation)."""
+    return """
+    CREATE INDEX IF NOT EXISTS idx_words_word_type ON words(word_type);
+    """
+
+def create_user_stats_user_index():
+    """Covering index for per-user stats aggregation."""
+    return """
+    CREATE INDEX IF NOT EXISTS idx_user_stats_user
+    ON user_stats(user_id, correct_answers, total_answers);
+    """
+
 def get_all_tables():
-    """Returns list of all table creation functions."""
+    """Returns list of all table and index creation functions."""
     return [
         create_words_table,
         create_users_table,
         create_user_stats_table,
         create_chat_contexts_table,
         create_group_tasks_table,
-        create_admins_table
+        create_admins_table,
+        create_words_word_type_index,
+        create_user_stats_user_index
     ]
@@ -1,7 +1,9 @@
 """
 Quiz command handlers.
 """
+import asyncio
 import logging
+import re
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
     ContextTypes,
@@ -14,6 +16,74 @@ from database.db import db
 
 logger = logging.getLogger(__name__)
 
+# Answer button callback data: "a<index>"
+ANSWER_CALLBACK_PATTERN = re.compile(r"^a(\d)$")
+
+# Old "answer_<index>" buttons still present in users' chats
+LEGACY_ANSWER_CALLBACK_PATTERN = re.compile(r"^answer_")
+
+
+def build_quiz_keyboard(quiz_data: dict) -> InlineKeyboardMarkup:
+    """Create inline keyboard with answer options, cached in quiz_data['markup']."""
+    markup = quiz_data.get('markup')
+    if markup is None:
+        keyboard = []
+        for i, answer in enumerate(quiz_data['answers']):
+            keyboard.append([InlineKeyboardButton(answer, callback_data=f"a{i}")])
+
+        markup = InlineKeyboardMarkup(keyboard)
+        quiz_data['markup'] = markup
+
+    return markup
+
+
+def format_quiz_question(quiz_data: dict) -> str:
+    """Format quiz question text."""
+    return (
+        f"{quiz_data['direction_label']}\n\n"
+        f"❓ {quiz_data['question']}\n\n"
+        f"Выберите правильный ответ:"
+    )
+
+
+async def is_session_active(context: ContextTypes.DEFAULT_TYPE, user_id: int) -> bool:
+    """Return quiz session flag, restoring it from the database after a restart."""
+    if 'session_active' not in context.user_data:
+        results = await db.aquery(
+            "SELECT quiz_session_active FROM users WHERE user_id = ?",
+            (user_id,)
+        )
+        restored = bool(results and results[0]['quiz_session_active'])
+        # Keep a value set by /quiz_session or /stop while the query ran
+        context.user_data.setdefault('session_active', restored)
+
+    return context.user_data['session_active']
+
+
+async def set_session_active(update: Update, context: ContextTypes.DEFAULT_TYPE, active: bool):
+    """Set quiz session flag in memory and persist it to the users table.
+
+    Writes for one user are serialized by a per-user lock and always store
+    the latest flag, so a quick /quiz_session + /stop can't leave a stale value.
+    """
+    user = update.effective_user
+    context.user_data['session_active'] = active
+
+    lock = context.user_data.setdefault('session_lock', asyncio.Lock())
+    async with lock:
+        await db.aupdate(
+            """
+            INSERT INTO users (user_id, username, first_name, quiz_session_active)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET
+                quiz_session_active = excluded.quiz_session_active,
+                username = excluded.username,
+                first_name = excluded.first_name
+            """,
+            (user.id, user.username, user.first_name,
+             1 if context.user_data['session_active'] else 0)
+        )
+
 
 async def quiz_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /quiz command - send single quiz question."""
@@ -32,20 +102,10 @@ async def quiz_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # Store quiz data in context for answer checking
     context.user_data['current_quiz'] = quiz_data
 
-    # Create inline keyboard with answer options
-    keyboard = []
-    for i, answer in enumerate(quiz_data['answers']):
-        keyboard.append([InlineKeyboardButton(answer, callback_data=f"answer_{i}")])
-
-    reply_markup = InlineKeyboardMarkup(keyboard)
-
     # Send quiz question
-    direction_emoji = "🇬🇷→🇷🇺" if quiz_data['direction'] == 'GR→RU' else "🇷🇺→🇬🇷"
     await update.message.reply_text(
-        f"{direction_emoji} {quiz_data['direction']}\n\n"
-        f"❓ {quiz_data['question']}\n\n"
-        f"Выберите правильный ответ:",
-        reply_markup=reply_markup
+        format_quiz_question(quiz_data),
+        reply_markup=build_quiz_keyboard(quiz_data)
     )
 
     logger.info(f"User {user.id} started quiz for word_id {quiz_data['word_id']}")
@@ -56,10 +116,7 @@ async def quiz_session_command(update: Update, context: ContextTypes.DEFAULT_TYP
     user = update.effective_user
 
     # Check if user already has active session
-    query = "SELECT quiz_session_active FROM users WHERE user_id = ?"
-    results = db.execute_query(query, (user.id,))
-
-    if results and results[0]['quiz_session_active']:
+    if await is_session_active(context, user.id):
         await update.message.reply_text(
             "⚠️ У вас уже активна сессия квиза.\n"
             "Используйте /stop для остановки."
@@ -67,10 +124,7 @@ async def quiz_session_command(update: Update, context: ContextTypes.DEFAULT_TYP
         return
 
     # Mark session as active
-    db.execute_update(
-        "INSERT OR REPLACE INTO users (user_id, username, first_name, quiz_session_active) VALUES (?, ?, ?, 1)",
-        (user.id, user.username, user.first_name)
-    )
+    await set_session_active(update, context, True)
 
     await update.message.reply_text(
         "🎯 Сессия квиза начата!\n\n"
@@ -88,13 +142,11 @@ async def stop_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.effective_user
 
     # Mark session as inactive
-    db.execute_update(
-        "UPDATE users SET quiz_session_active = 0 WHERE user_id = ?",
-        (user.id,)
-    )
+    await set_session_active(update, context, False)
 
-    # Get final stats
-    stats = stats_service.get_user_stats(user.id)
+    # Get final stats and release cached totals
+    stats = await asyncio.to_thread(stats_service.get_user_stats, user.id)
+    stats_service.invalidate_user_stats(user.id)
 
     await update.message.reply_text(
         f"🛑 Сессия квиза остановлена.\n\n"
@@ -110,24 +162,27 @@ async def stop_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def answer_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle answer button callback."""
     query = update.callback_query
-    await query.answer()
-
     user = update.effective_user
 
-    # Get stored quiz data
-    quiz_data = context.user_data.get('current_quiz')
+    # Take stored quiz data before the first await: handlers run
+    # concurrently, so a double tap must not answer the same quiz twice
+    quiz_data = context.user_data.pop('current_quiz', None)
     if not quiz_data:
-        await query.edit_message_text("❌ Ошибка: данные квиза не найдены. Попробуйте /quiz снова.")
+        # Notify without editing, so a duplicate tap doesn't overwrite
+        # the feedback of the tap being processed
+        await query.answer("❌ Ошибка: данные квиза не найдены. Попробуйте /quiz снова.")
         return
 
-    # Parse answer index from callback data
-    answer_index = int(query.data.split('_')[1])
+    await query.answer()
+
+    # Answer index was already captured by the handler pattern
+    answer_index = int(context.matches[0].group(1))
 
     # Check if answer is correct
     is_correct = quiz_service.check_answer(quiz_data, answer_index)
 
-    # Record answer in statistics
-    stats_service.record_answer(user.id, quiz_data['word_id'], is_correct)
+    # Record answer in statistics and get updated totals in one thread hop
+    stats = await asyncio.to_thread(stats_service.record_answer, user.id, quiz_data['word_id'], is_correct)
 
     # Prepare response
     if is_correct:
@@ -137,47 +192,35 @@ async def answer_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         response = f"❌ Неправильно.\n\nПравильный ответ: {correct_answer}\n\n"
 
     # Add stats
-    stats = stats_service.get_user_stats(user.id)
     response += (
         f"📊 Ваша статистика:\n"
         f"Правильных ответов: {stats['total_correct']}/{stats['total_questions']} "
         f"({stats['success_rate']}%)\n\n"
-        f"Используйте /quiz для следующего вопроса"
     )
 
-    await query.edit_message_text(response)
-
-    # Clear quiz data
-    context.user_data['current_quiz'] = None
-
-    # Check if user has active session
-    query_check = "SELECT quiz_session_active FROM users WHERE user_id = ?"
-    results = db.execute_query(query_check, (user.id,))
-
-    if results and results[0]['quiz_session_active']:
-        # Send next question automatically
-        import asyncio
-        await asyncio.sleep(1)  # Small delay
-
-        # Generate and send next quiz
-        quiz_data = quiz_service.generate_quiz(user.id)
-        if quiz_data:
-            context.user_data['current_quiz'] = quiz_data
-
-            keyboard = []
-            for i, answer in enumerate(quiz_data['answers']):
-                keyboard.append([InlineKeyboardButton(answer, callback_data=f"answer_{i}")])
+    # In an active session, show the next question in the same message
+    # instead of sending a separate one
+    next_quiz = None
+    if await is_session_active(context, user.id):
+        next_quiz = quiz_service.generate_quiz(user.id)
+
+    if next_quiz:
+        context.user_data['current_quiz'] = next_quiz
+        await query.edit_message_text(
+            response + format_quiz_question(next_quiz),
+            reply_markup=build_quiz_keyboard(next_quiz)
+        )
+    else:
+        await query.edit_message_text(response + "Используйте /quiz для следующего вопроса")
 
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            direction_emoji = "🇬🇷→🇷🇺" if quiz_data['direction'] == 'GR→RU' else "🇷🇺→🇬🇷"
+    logger.info(f"User {user.id} answered {'correctly' if is_correct else 'incorrectly'}")
 
-            await context.bot.send_message(
-                chat_id=user.id,
-                text=f"{direction_emoji} {quiz_data['direction']}\n\n❓ {quiz_data['question']}\n\nВыберите правильный ответ:",
-                reply_markup=reply_markup
-            )
 
-    logger.info(f"User {user.id} answered {'correctly' if is_correct else 'incorrectly'}")
+async def legacy_answer_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle answer buttons from messages sent before the callback data change."""
+    query = update.callback_query
+    await query.answer()
+    await query.edit_message_text("❌ Ошибка: данные квиза не найдены. Попробуйте /quiz снова.")
 
 
 # Handlers to register in bot.py
@@ -187,5 +230,6 @@ def get_quiz_handlers():
         CommandHandler("quiz", quiz_command),
         CommandHandler("quiz_session", quiz_session_command),
         CommandHandler("stop", stop_command),
-        CallbackQueryHandler(answer_callback, pattern="^answer_"),
+        CallbackQueryHandler(answer_callback, pattern=ANSWER_CALLBACK_PATTERN),
+        CallbackQueryHandler(legacy_answer_callback, pattern=LEGACY_ANSWER_CALLBACK_PATTERN),
     ]
@@ -5,12 +5,21 @@ import random
 from typing import Dict, List, Optional
 from datetime import datetime
 from database.db import db
-from utils.wrong_answers import generate_wrong_answers
+from utils.wrong_answers import fetch_distractors
+
+# Direction labels shown above quiz questions
+DIR_GR_RU = "🇬🇷→🇷🇺 GR→RU"
+DIR_RU_GR = "🇷🇺→🇬🇷 RU→GR"
 
 
 class QuizService:
     """Handles quiz generation and answer checking."""
 
+    def _get_max_word_id(self) -> int:
+        """Return the largest id in the words table (0 if empty)."""
+        results = db.execute_query("SELECT MAX(id) FROM words", row_factory=None)
+        return results[0][0] or 0
+
     def select_random_word(self, user_id: Optional[int] = None) -> Optional[Dict]:
         """
         Select a random word for quiz.
@@ -22,18 +31,28 @@ class QuizService:
         Returns:
             Dictionary with word data or None if no words available
         """
-        query = "SELECT * FROM words ORDER BY RANDOM() LIMIT 1"
-        results = db.execute_query(query)
+        if not db.words.is_empty():
+            return dict(random.choice(db.words.words))
+
+        # Fallback when the word store is empty (e.g. words inserted
+        # without db.words.refresh()): pick a random id and take the first
+        # existing word at or after it
+        max_id = self._get_max_word_id()
+        if max_id <= 0:
+            return None
+
+        query = "SELECT id, greek, russian, word_type FROM words WHERE id >= ? ORDER BY id LIMIT 1"
+        results = db.execute_query(query, (random.randint(1, max_id),), row_factory=None)
 
         if not results:
             return None
 
-        row = results[0]
+        word_id, greek, russian, word_type = results[0]
         return {
-            'id': row['id'],
-            'greek': row['greek'],
-            'russian': row['russian'],
-            'word_type': row['word_type']
+            'id': word_id,
+            'greek': greek,
+            'russian': russian,
+            'word_type': word_type
         }
 
     def generate_quiz(self, user_id: Optional[int] = None) -> Optional[Dict]:
@@ -51,18 +70,6 @@ class QuizService:
         if not word:
             return None
 
-        # Generate wrong answers
-        wrong_answers = generate_wrong_answers(
-            word['id'],
-            word['word_type'],
-            word['russian'],
-            count=3
-        )
-
-        if len(wrong_answers) < 3:
-            # Not enough words in database for quiz
-            return None
-
         # Randomly choose quiz direction: GR→RU or RU→GR
         is_greek_to_russian = random.choice([True, False])
 
@@ -72,15 +79,18 @@ class QuizService:
         else:
             question = word['russian']
             correct_answer = word['greek']
-            # For RU→GR, get wrong Greek words
-            query = """
-                SELECT greek FROM words
-                WHERE id != ? AND word_type = ?
-                ORDER BY RANDOM()
-                LIMIT 3
-            """
-            results = db.execute_query(query, (word['id'], word['word_type']))
-            wrong_answers = [row['greek'] for row in results]
+
+        # Generate wrong answers in the answer language with a single query
+        wrong_answers = fetch_distractors(
+            word['id'],
+            word['word_type'],
+            field='russian' if is_greek_to_russian else 'greek',
+            count=3
+        )
+
+        if len(wrong_answers) < 3:
+            # Not enough words in database for quiz
+            return None
 
         # Combine and shuffle answers
         all_answers = [correct_answer] + wrong_answers
@@ -95,6 +105,7 @@ class QuizService:
             'answers': all_answers,
             'correct_index': correct_index,
             'direction': 'GR→RU' if is_greek_to_russian else 'RU→GR',
+            'direction_label': DIR_GR_RU if is_greek_to_russian else DIR_RU_GR,
             'word_type': word['word_type']
         }
 
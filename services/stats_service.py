@@ -1,6 +1,8 @@
 """
 Statistics tracking service.
 """
+import sqlite3
+import threading
 from datetime import datetime
 from typing import Optional, Dict
 from database.db import db
@@ -10,7 +12,14 @@ import config
 class StatsService:
     """Handles user statistics and progress tracking."""
 
-    def record_answer(self, user_id: int, word_id: int, is_correct: bool):
+    def __init__(self):
+        """Initialize stats service with an empty per-user totals cache."""
+        # user_id -> {'total_correct': int, 'total_questions': int}
+        self._stats_cache: Dict[int, Dict] = {}
+        # Methods run in worker threads (asyncio.to_thread); guards _stats_cache
+        self._cache_lock = threading.Lock()
+
+    def record_answer(self, user_id: int, word_id: int, is_correct: bool) -> Dict:
         """
         Record user's answer to a quiz question.
 
@@ -18,36 +27,46 @@ class StatsService:
             user_id: Telegram user ID
             word_id: ID of the word
             is_correct: Whether answer was correct
+
+        Returns:
+            Updated overall statistics, same format as get_user_stats()
         """
-        # Check if stat entry exists
-        query = "SELECT * FROM user_stats WHERE user_id = ? AND word_id = ?"
-        results = db.execute_query(query, (user_id, word_id))
-
-        if results:
-            # Update existing stat
-            stat = results[0]
-            new_correct = stat['correct_answers'] + (1 if is_correct else 0)
-            new_total = stat['total_answers'] + 1
-
-            update_query = """
-                UPDATE user_stats
-                SET correct_answers = ?, total_answers = ?, last_asked = ?
-                WHERE user_id = ? AND word_id = ?
-            """
-            db.execute_update(
-                update_query,
-                (new_correct, new_total, datetime.now(), user_id, word_id)
-            )
-        else:
-            # Insert new stat
-            insert_query = """
-                INSERT INTO user_stats (user_id, word_id, correct_answers, total_answers, last_asked)
-                VALUES (?, ?, ?, ?, ?)
-            """
-            db.execute_update(
-                insert_query,
-                (user_id, word_id, 1 if is_correct else 0, 1, datetime.now())
-            )
+        # Insert new stat or update existing one in a single statement
+        upsert_query = """
+            INSERT INTO user_stats (user_id, word_id, correct_answers, total_answers, last_asked)
+            VALUES (?, ?, ?, 1, ?)
+            ON CONFLICT(user_id, word_id) DO UPDATE SET
+                correct_answers = correct_answers + excluded.correct_answers,
+                total_answers = total_answers + 1,
+                last_asked = excluded.last_asked
+        """
+        try:
+            with db.transaction() as cursor:
+                cursor.execute(
+                    upsert_query,
+                    (user_id, word_id, 1 if is_correct else 0, datetime.now())
+                )
+
+                # Update cached totals while holding the single writer
+                # connection, so concurrent answers apply in commit order
+                with self._cache_lock:
+                    cached = self._stats_cache.get(user_id)
+                    if cached is not None:
+                        cached['total_correct'] += 1 if is_correct else 0
+                        cached['total_questions'] += 1
+                        totals = dict(cached)
+
+                if cached is None:
+                    # Load totals in the same transaction (includes this answer)
+                    totals = self._load_user_totals(user_id, cursor)
+                    with self._cache_lock:
+                        self._stats_cache[user_id] = dict(totals)
+        except Exception:
+            # Cache may already count an answer that was rolled back
+            self.invalidate_user_stats(user_id)
+            raise
+
+        return self._format_stats(totals)
 
     def get_user_stats(self, user_id: int) -> Dict:
         """
@@ -59,6 +78,44 @@ class StatsService:
         Returns:
             Dictionary with statistics
         """
+        with self._cache_lock:
+            cached = self._stats_cache.get(user_id)
+            if cached is not None:
+                cached = dict(cached)
+
+        if cached is None:
+            totals = self._load_user_totals(user_id)
+            with self._cache_lock:
+                # Keep an entry a concurrent record_answer stored meanwhile,
+                # it's fresher than our read
+                cached = dict(self._stats_cache.setdefault(user_id, totals))
+
+        return self._format_stats(cached)
+
+    def invalidate_user_stats(self, user_id: int):
+        """
+        Drop cached totals for a user. Next get_user_stats() reloads from database.
+
+        Args:
+            user_id: Telegram user ID
+        """
+        with self._cache_lock:
+            self._stats_cache.pop(user_id, None)
+
+    def _format_stats(self, totals: Dict) -> Dict:
+        """Build statistics dictionary with success rate from raw totals."""
+        total_correct = totals['total_correct']
+        total_questions = totals['total_questions']
+        success_rate = (total_correct / total_questions * 100) if total_questions > 0 else 0.0
+
+        return {
+            'total_correct': total_correct,
+            'total_questions': total_questions,
+            'success_rate': round(success_rate, 1)
+        }
+
+    def _load_user_totals(self, user_id: int, cursor: Optional[sqlite3.Cursor] = None) -> Dict:
+        """Aggregate user's totals from user_stats table, optionally on an open cursor."""
         query = """
             SELECT
                 SUM(correct_answers) as total_correct,
@@ -66,23 +123,17 @@ class StatsService:
             FROM user_stats
             WHERE user_id = ?
         """
-        results = db.execute_query(query, (user_id,))
+        if cursor is not None:
+            results = cursor.execute(query, (user_id,)).fetchall()
+        else:
+            results = db.execute_query(query, (user_id,))
 
         if not results or results[0]['total_questions'] is None:
-            return {
-                'total_correct': 0,
-                'total_questions': 0,
-                'success_rate': 0.0
-            }
-
-        total_correct = results[0]['total_correct']
-        total_questions = results[0]['total_questions']
-        success_rate = (total_correct / total_questions * 100) if total_questions > 0 else 0.0
+            return {'total_correct': 0, 'total_questions': 0}
 
         return {
-            'total_correct': total_correct,
-            'total_questions': total_questions,
-            'success_rate': round(success_rate, 1)
+            'total_correct': results[0]['total_correct'],
+            'total_questions': results[0]['total_questions']
         }
 
 
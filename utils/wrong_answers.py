@@ -2,69 +2,81 @@
 Generate wrong answers for quiz questions.
 """
 import random
-from typing import List
+from typing import Callable, Dict, List
 from database.db import db
 
+# Extra words drawn from the in-memory pool to cover filtered-out matches
+DRAW_EXTRA = 2
 
-def generate_wrong_answers_for_word(correct_word_id: int, word_type: str, count: int = 3) -> List[str]:
-    """
-    Generate wrong answers by selecting random words of the same type.
 
-    Args:
-        correct_word_id: ID of the correct word
-        word_type: Type of word (noun, verb, etc.)
-        count: Number of wrong answers needed
-
-    Returns:
-        List of wrong answer translations
+def _draw_from_store(word_type: str, field: str, count: int,
+                     keep: Callable[[Dict], bool]) -> List[str]:
     """
-    query = """
-        SELECT russian FROM words
-        WHERE id != ? AND word_type = ?
-        ORDER BY RANDOM()
-        LIMIT ?
+    Draw up to `count` random `field` values from the word store's `word_type` pool.
+
+    Samples only a few more words than needed and drops those rejected by
+    `keep` (the correct word), so the cost doesn't grow with the pool size.
+    Filters the whole pool only if the small sample came up short.
     """
-    results = db.execute_query(query, (correct_word_id, word_type, count))
-    return [row['russian'] for row in results]
+    pool = db.words.by_type.get(word_type, [])
+    sample = random.sample(pool, min(len(pool), count + DRAW_EXTRA))
+    values = [word[field] for word in sample if keep(word)]
 
+    if len(values) < count and len(sample) < len(pool):
+        values = [word[field] for word in pool if keep(word)]
+        values = random.sample(values, min(count, len(values)))
 
-def generate_wrong_answers_for_phrase(correct_phrase: str, count: int = 3) -> List[str]:
-    """
-    Generate wrong answers for phrases.
-    For MVP: Select random other phrases.
-    Future: Use LLM to generate similar but wrong phrases.
+    return values[:count]
 
-    Args:
-        correct_phrase: The correct phrase
-        count: Number of wrong answers needed
 
-    Returns:
-        List of wrong answer translations
+def _select_random(column: str, condition: str, params: tuple, count: int) -> List[str]:
+    """
+    Select `count` random values of `column` from words matching `condition`.
+
+    Conditions filter on word_type, so idx_words_word_type narrows the
+    random sort to words of one type.
     """
-    query = """
-        SELECT russian FROM words
-        WHERE russian != ? AND word_type = 'phrase'
+    query = f"""
+        SELECT {column} FROM words
+        WHERE {condition}
         ORDER BY RANDOM()
         LIMIT ?
     """
-    results = db.execute_query(query, (correct_phrase, count))
-    return [row['russian'] for row in results]
+    results = db.execute_query(query, params + (count,), row_factory=None)
+    return [row[0] for row in results]
 
 
-def generate_wrong_answers(word_id: int, word_type: str, correct_answer: str, count: int = 3) -> List[str]:
+def fetch_distractors(word_id: int, word_type: str, field: str = 'russian', count: int = 3) -> List[str]:
     """
-    Main function to generate wrong answers based on word type.
+    Fetch wrong answers of the same type in the quiz's answer language.
+
+    Works for either direction: `field` selects the column shown as answer
+    options. Draws from the in-memory word store (db.words.by_type) without
+    touching SQL; queries the words table only if the correct word isn't in
+    the store. Words whose `field` text equals the correct word's are
+    skipped, so options never repeat the correct answer.
 
     Args:
         word_id: ID of the correct word
         word_type: Type (noun, verb, phrase, etc.)
-        correct_answer: The correct translation
+        field: Answer column, 'russian' for GR→RU or 'greek' for RU→GR
         count: Number of wrong answers needed
 
     Returns:
         List of wrong answers
     """
-    if word_type == 'phrase':
-        return generate_wrong_answers_for_phrase(correct_answer, count)
-    else:
-        return generate_wrong_answers_for_word(word_id, word_type, count)
+    if field not in ('greek', 'russian'):
+        raise ValueError(f"Unknown answer field: {field}")
+
+    correct_word = db.words.by_id.get(word_id)
+    if correct_word is not None:
+        return _draw_from_store(
+            word_type, field, count,
+            lambda word: word['id'] != word_id and word[field] != correct_word[field]
+        )
+
+    return _select_random(
+        field,
+        f"id != ? AND word_type = ? AND {field} != (SELECT {field} FROM words WHERE id = ?)",
+        (word_id, word_type, word_id), count
+    )